@@ -1,4 +1,6 @@
 ﻿import enum
+import os
+from concurrent.futures import ProcessPoolExecutor
 from dataclasses import dataclass, field
 from pathlib import Path
 from typing import Dict, List, Tuple
@@ -6,6 +8,17 @@ from typing import Dict, List, Tuple
 import numpy as np
 import pandas as pd
 
+try:
+    from numba import njit
+    _HAVE_NUMBA = True
+except ImportError:  # Numba is optional – fall back to the NumPy block core
+    _HAVE_NUMBA = False
+
+    def njit(*args, **kwargs):
+        def decorate(func):
+            return func
+        return decorate
+
 # ===== ENUMS ================================================================
 
 class HeatPumpType(enum.Enum):
@@ -16,7 +29,7 @@ class HeatPumpType(enum.Enum):
 
 # ===== CONFIGURATION ========================================================
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class ComponentLimits:
     """Rated power / capacities for individual devices (kW, kWh)."""
     p_bat_charge: float = 20.0   # kW  (positive = charge, negative = discharge)
@@ -25,7 +38,7 @@ class ComponentLimits:
     p_fuel_cell: float = 10.0
 
 
-@dataclass
+@dataclass(slots=True)
 class SystemParameters:
     # -------- File & data -------------
     excel_path: str | Path = "EnergiData.xlsx"
@@ -73,10 +86,6 @@ class ExcelDataLoader:
         self.params = params
 
     def load(self) -> pd.DataFrame:
-        df = pd.read_excel(
-            self.params.excel_path,
-            sheet_name=self.params.sheet_name
-        )
         expected_cols = {
             self.params.time_column,
             self.params.pv_column,
@@ -85,15 +94,91 @@ class ExcelDataLoader:
             self.params.dhw_column,
             *self.params.cop_columns,
         }
+
+        # Parquet cache: the validated, sorted table reloads in a few ms,
+        # against seconds for any xlsx engine. Stale caches (older than the
+        # workbook) or caches missing a requested column fall through to
+        # the normal read below.
+        excel_path = Path(self.params.excel_path)
+        cache_path = excel_path.with_suffix(".parquet")
+        if cache_path.exists() and cache_path.stat().st_mtime >= excel_path.stat().st_mtime:
+            try:
+                df = pd.read_parquet(cache_path)
+            except Exception:
+                # No parquet engine, or a corrupt/truncated cache file.
+                # The engines raise ValueError subclasses (ArrowInvalid),
+                # not OSError, so catch broadly: any unreadable cache must
+                # fall through to the workbook read below.
+                pass
+            else:
+                if not expected_cols.difference(df.columns):
+                    return df
+
+        try:
+            # calamine (Rust) parses xlsx several times faster than openpyxl,
+            # and usecols skips every cell we never read.
+            df = pd.read_excel(
+                self.params.excel_path,
+                sheet_name=self.params.sheet_name,
+                engine="calamine",
+                usecols=sorted(expected_cols),
+                dtype=np.float64,
+            )
+        except (ImportError, ValueError):
+            # python-calamine not installed, or usecols did not match the
+            # sheet; re-read everything so the check below reports what is
+            # actually missing.
+            df = pd.read_excel(
+                self.params.excel_path,
+                sheet_name=self.params.sheet_name
+            )
         missing = expected_cols.difference(df.columns)
         if missing:
             raise KeyError(f"Missing columns in Excel: {missing}")
 
         # Ensure correct ordering and set a proper datetime index if desired
         df = df.sort_values(self.params.time_column).reset_index(drop=True)
+
+        # Caching is best-effort: write to a temp file and rename so an
+        # interrupted write can never leave a half-written cache that is
+        # newer than the workbook.
+        tmp_path = cache_path.with_suffix(".parquet.tmp")
+        try:
+            df.to_parquet(tmp_path)
+            os.replace(tmp_path, cache_path)
+        except (ImportError, OSError):
+            tmp_path.unlink(missing_ok=True)
         return df
 
 
+@dataclass
+class SimInputs:
+    """The input columns of one simulation as contiguous float64 arrays.
+
+    The simulator works purely on these arrays; pandas is only involved in
+    the loader (and in wrapping the results at the end of a run).
+    """
+    pv: np.ndarray
+    plug: np.ndarray
+    q_space: np.ndarray
+    q_dhw: np.ndarray
+    cop: np.ndarray
+
+    @classmethod
+    def from_dataframe(cls, df: pd.DataFrame, params: SystemParameters) -> "SimInputs":
+        """One-time extraction of the columns selected by *params*."""
+        return cls(
+            pv=df[params.pv_column].to_numpy(dtype=np.float64),
+            plug=df[params.plug_column].to_numpy(dtype=np.float64),
+            q_space=df[params.space_heat_column].to_numpy(dtype=np.float64),
+            q_dhw=df[params.dhw_column].to_numpy(dtype=np.float64),
+            cop=df[params.heat_pump_type.value].to_numpy(dtype=np.float64),
+        )
+
+    def __len__(self) -> int:
+        return self.pv.shape[0]
+
+
 # ===== DEVICES ==============================================================
 
 class Battery:
@@ -151,15 +236,263 @@ class HydrogenStore:
         return p_ac, p_heat
 
 
+# ===== SIMULATION CORE ======================================================
+
+_EPS = 1e-6  # kW tolerance (~1 Wh per hour): smaller grid flows are noise
+
+@njit(cache=True, fastmath=True)
+def _simulate_core(
+    net, dt,
+    soc, cap_bat, eta_c, eta_d, p_bat_ch_max, p_bat_disch_max,
+    h2, cap_h2, eta_elec, eta_fc, p_elec_max, p_fc_max,
+    bat_ch_log, bat_disch_log, soc_log,
+    elec_log, fc_log, h2_log,
+    grid_exp_log, grid_imp_log, heat_fc_log,
+):
+    """Sequential per-hour dispatch, battery and H2 physics.
+
+    Only the stateful part lives here: ``net`` (PV minus load, kW) is fully
+    precomputed by the caller, as are the stateless log columns.  The
+    Battery / HydrogenStore methods are inlined as plain scalar arithmetic
+    so Numba can compile the whole loop to machine code; the classes remain
+    the reference implementation for non-JIT use.  State is carried in
+    ``soc`` / ``h2`` (kWh) and the trajectories are written into the
+    preallocated ``*_log`` output arrays.  Returns the final (soc, h2).
+    """
+    n = net.shape[0]
+
+    for i in range(n):
+        net_kw = net[i]                               # + surplus / – deficit
+
+        # Split the signed net power into two non-negative halves and run
+        # both cascades unconditionally: with a zero surplus (or deficit)
+        # every clamp below collapses to a no-op, so there is no
+        # data-dependent branch on the sign of net_kw. The same holds for
+        # the devices themselves – fed a zero surplus (or an empty store)
+        # the min() clamps return 0.0 – so the electrolyser and fuel cell
+        # run every hour too and the loop body is pure straight-line code.
+        surplus_kw = max(net_kw, 0.0)
+        deficit_kw = max(-net_kw, 0.0)
+
+        # 2a) Surplus cascade: battery charge, then electrolyser -----------
+        e_in = min(surplus_kw, p_bat_ch_max) * dt * eta_c
+        e_act = min(e_in, cap_bat - soc)
+        soc += e_act
+        p_bat_ch = e_act / dt
+        # Flooring the remainder at _EPS is a branchless select, not a
+        # branch; it keeps sub-EPS rounding residue (which differs between
+        # this core and the NumPy one under fastmath) out of the stores.
+        net_after_bat = surplus_kw - p_bat_ch
+        net_after_bat = net_after_bat if net_after_bat > _EPS else 0.0
+        e_h2 = min(net_after_bat, p_elec_max) * dt * eta_elec
+        e_act = min(e_h2, cap_h2 - h2)
+        h2 += e_act
+        p_elec = e_act / (eta_elec * dt)
+        net_after_bat -= p_elec
+        p_grid_exp = net_after_bat
+
+        # 2b) Deficit cascade: battery discharge, then fuel cell -----------
+        e_out_req = min(deficit_kw, p_bat_disch_max) * dt / eta_d
+        e_avail = min(e_out_req, soc)
+        soc -= e_avail
+        p_bat_disch = e_avail * eta_d / dt
+        deficit_after_bat = deficit_kw - p_bat_disch
+        deficit_after_bat = deficit_after_bat if deficit_after_bat > _EPS else 0.0
+
+        e_h2_needed = min(deficit_after_bat, p_fc_max) * dt / eta_fc
+        e_avail = min(e_h2_needed, h2)
+        h2 -= e_avail
+        p_fc_kw = e_avail * eta_fc / dt
+        heat_from_fc_kw = (e_avail - p_fc_kw * dt) / dt
+        deficit_after_bat -= p_fc_kw
+
+        # 2c) Whatever is still missing is imported from grid. Sub-EPS
+        #     noise in export/import is floored by the caller in one
+        #     vector pass over the finished log arrays.
+        p_grid_imp = deficit_after_bat
+
+        # 4) Log the stateful quantities ------------------------------------
+        bat_ch_log[i] = p_bat_ch
+        bat_disch_log[i] = p_bat_disch
+        soc_log[i] = soc
+        elec_log[i] = p_elec
+        fc_log[i] = p_fc_kw
+        h2_log[i] = h2
+        grid_exp_log[i] = p_grid_exp
+        grid_imp_log[i] = p_grid_imp
+        heat_fc_log[i] = heat_from_fc_kw * dt         # convert back to kWh_th
+
+    return soc, h2
+
+
+# Storage regimes for the speculative NumPy core. A store sitting exactly at
+# a bound is a *stable* state with state-free behaviour (clamps yield exactly
+# 0.0), so whole saturated stretches can be vectorized just like unclamped
+# ("interior") ones. Emptying (soc -= soc) and topping up (soc += cap - soc)
+# land exactly on the bound in IEEE arithmetic, which is what makes the FULL
+# and EMPTY regimes exact rather than approximate.
+_INTERIOR, _FULL, _EMPTY = 0, 1, 2
+
+
+def _simulate_core_numpy(
+    net, dt,
+    soc, cap_bat, eta_c, eta_d, p_bat_ch_max, p_bat_disch_max,
+    h2, cap_h2, eta_elec, eta_fc, p_elec_max, p_fc_max,
+    bat_ch_log, bat_disch_log, soc_log,
+    elec_log, fc_log, h2_log,
+    grid_exp_log, grid_imp_log, heat_fc_log,
+    block: int = 128,
+):
+    """Vectorized drop-in for :func:`_simulate_core`, used without Numba.
+
+    Speculatively evaluates blocks of hours with vector arithmetic under the
+    assumption that each store stays in its current regime (interior, pinned
+    full, or pinned empty); the power-limit clamps are state-free and always
+    valid. The guessed soc/H2 trajectories are then validated against the
+    exact clamp conditions of the scalar core. A regime change (battery
+    starts discharging out of full, fuel cell wakes the H2 store, ...) just
+    cuts the block and re-speculates; only a *partially* binding clamp –
+    the one hour in which a store fills or empties partway through – falls
+    back to the scalar step. Committed hours are bit-identical to the
+    scalar core because every expression is evaluated verbatim.
+    """
+    n = net.shape[0]
+    step = getattr(_simulate_core, "py_func", _simulate_core)
+
+    surplus = np.maximum(net, 0.0)
+    deficit = np.maximum(-net, 0.0)
+
+    # Regime-independent power-limit clamps (same expressions as the core).
+    e_in_all = np.minimum(surplus, p_bat_ch_max) * dt * eta_c
+    e_out_all = np.minimum(deficit, p_bat_disch_max) * dt / eta_d
+
+    # EMPTY must be exact for both stores: a tiny but non-zero level still
+    # discharges, and draining (x -= x) lands exactly on 0.0.
+    r_bat = _FULL if soc == cap_bat else (_EMPTY if soc == 0.0 else _INTERIOR)
+    r_h2 = _FULL if h2 == cap_h2 else (_EMPTY if h2 == 0.0 else _INTERIOR)
+
+    i = 0
+    while i < n:
+        j = min(i + block, n)
+        m = j - i
+        sur = surplus[i:j]
+        dfc = deficit[i:j]
+        e_in = e_in_all[i:j]
+        e_out = e_out_all[i:j]
+
+        # --- Speculative device arithmetic under the current regimes ------
+        e_act_in = e_in if r_bat != _FULL else np.zeros(m)
+        p_ch = e_act_in / dt
+        net_after = sur - p_ch
+        net_after = np.where(net_after > _EPS, net_after, 0.0)
+        e_h2_in = np.minimum(net_after, p_elec_max) * dt * eta_elec
+        e_act_h2 = e_h2_in if r_h2 != _FULL else np.zeros(m)
+        p_elec = e_act_h2 / (eta_elec * dt)
+        net_after2 = net_after - p_elec
+        exp = net_after2                 # noise floor applied by the caller
+
+        e_avail_out = e_out if r_bat != _EMPTY else np.zeros(m)
+        p_dis = e_avail_out * eta_d / dt
+        deficit_after = dfc - p_dis
+        deficit_after = np.where(deficit_after > _EPS, deficit_after, 0.0)
+        e_need = np.minimum(deficit_after, p_fc_max) * dt / eta_fc
+        e_act_fc = e_need if r_h2 == _INTERIOR else np.zeros(m)
+        p_fc = e_act_fc * eta_fc / dt
+        heat_fc = ((e_act_fc - p_fc * dt) / dt) * dt
+        deficit_after2 = deficit_after - p_fc
+        imp = deficit_after2
+
+        dsoc = e_act_in - e_avail_out   # at most one term non-zero: exact
+        dh2 = e_act_h2 - e_act_fc
+        # Seed the cumsum with the entry state so the accumulation rounds in
+        # exactly the same order as the sequential soc += / h2 += updates.
+        soc_traj = np.cumsum(np.concatenate(((soc,), dsoc)))[1:]
+        h2_traj = np.cumsum(np.concatenate(((h2,), dh2)))[1:]
+        soc_prev = np.empty(m); soc_prev[0] = soc; soc_prev[1:] = soc_traj[:-1]
+        h2_prev = np.empty(m); h2_prev[0] = h2; h2_prev[1:] = h2_traj[:-1]
+
+        # --- Hours whose clamp binds partway: need the scalar step --------
+        scal = np.zeros(m, dtype=bool)
+        if r_bat != _FULL:
+            scal |= e_in > cap_bat - soc_prev
+        if r_bat != _EMPTY:
+            scal |= e_out > soc_prev
+        if r_h2 != _FULL:
+            scal |= e_h2_in > cap_h2 - h2_prev
+        if r_h2 == _INTERIOR:
+            scal |= e_need > h2_prev
+
+        # --- Hours that merely change regime: cut the block and retry -----
+        trans = np.zeros(m, dtype=bool)
+        if r_bat == _FULL:
+            trans |= e_out > 0.0
+        elif r_bat == _EMPTY:
+            trans |= (e_out > 0.0) & (soc_prev > 0.0)
+        if r_h2 == _FULL:
+            trans |= e_need > 0.0
+        elif r_h2 == _EMPTY:
+            trans |= (e_need > 0.0) & (h2_prev > 0.0)
+
+        bad = scal | trans
+        k = int(np.argmax(bad)) if bad.any() else m
+        if k > 0:
+            s = slice(i, i + k)
+            bat_ch_log[s] = p_ch[:k]
+            bat_disch_log[s] = p_dis[:k]
+            soc_log[s] = soc_traj[:k]
+            elec_log[s] = p_elec[:k]
+            fc_log[s] = p_fc[:k]
+            h2_log[s] = h2_traj[:k]
+            grid_exp_log[s] = exp[:k]
+            grid_imp_log[s] = imp[:k]
+            heat_fc_log[s] = heat_fc[:k]
+            soc = soc_traj[k - 1]
+            h2 = h2_traj[k - 1]
+            i += k
+        if k < m:
+            if scal[k]:
+                # Hour i binds a clamp partway – advance it scalar.
+                soc, h2 = step(
+                    net[i:i + 1], dt,
+                    soc, cap_bat, eta_c, eta_d, p_bat_ch_max, p_bat_disch_max,
+                    h2, cap_h2, eta_elec, eta_fc, p_elec_max, p_fc_max,
+                    bat_ch_log[i:i + 1], bat_disch_log[i:i + 1], soc_log[i:i + 1],
+                    elec_log[i:i + 1], fc_log[i:i + 1], h2_log[i:i + 1],
+                    grid_exp_log[i:i + 1], grid_imp_log[i:i + 1],
+                    heat_fc_log[i:i + 1],
+                )
+                i += 1
+                r_bat = _FULL if soc == cap_bat else (_EMPTY if soc == 0.0 else _INTERIOR)
+                r_h2 = _FULL if h2 == cap_h2 else (_EMPTY if h2 == 0.0 else _INTERIOR)
+            else:
+                # Pure regime change: hour i is re-evaluated next iteration.
+                if r_bat != _INTERIOR and (e_out[k] > 0.0) and (r_bat == _FULL or soc_prev[k] > 0.0):
+                    r_bat = _INTERIOR
+                if r_h2 == _FULL and e_need[k] > 0.0:
+                    r_h2 = _INTERIOR
+                elif r_h2 == _EMPTY and e_need[k] > 0.0 and h2_prev[k] > 0.0:
+                    r_h2 = _INTERIOR
+
+    return soc, h2
+
+
 # ===== SIMULATOR ============================================================
 
 class MicrogridSimulator:
-    def __init__(self, params: SystemParameters, df: pd.DataFrame):
+    def __init__(self, params: SystemParameters, inputs: SimInputs | pd.DataFrame):
         self.p = params
-        self.df = df
+        if isinstance(inputs, pd.DataFrame):
+            inputs = SimInputs.from_dataframe(inputs, params)
+        self.inputs = inputs
         self.battery = Battery(params)
         self.h2 = HydrogenStore(params)
-        self.logs: Dict[str, List[float]] = {k: [] for k in [
+        # One contiguous buffer per logged quantity, sized up front
+        # (structure-of-arrays); the final DataFrame wraps these without a
+        # copy. float32 is plenty for logged kW values (~4 significant
+        # digits of physical meaning) and halves the memory traffic of the
+        # plotting reductions; the soc/H2 state itself stays float64 inside
+        # the core so no drift accumulates.
+        self.logs: Dict[str, np.ndarray] = {k: np.empty(len(inputs), dtype=np.float32) for k in [
             "pv_ac", "load", "net_before",
             "p_bat_charge", "p_bat_discharge", "soc_bat",
             "p_elec", "p_fc", "h2_store",
@@ -168,92 +501,98 @@ class MicrogridSimulator:
             "heat_total_demand", "hp_electricity",
         ]}
 
-    # ---- Helpers -----------------------------------------------------------
-
-    def _log(self, **kwargs):
-        for k, v in kwargs.items():
-            self.logs[k].append(v)
-
     # ---- Main loop ---------------------------------------------------------
 
     def run(self) -> pd.DataFrame:
-        cop_col = self.p.heat_pump_type.value
         dt = 1.0  # hours per time-step
-        EPS = 1e-6  # kW tolerance (~1 Wh per hour)
-
-        for _, row in self.df.iterrows():
-            # 1) Basic demands & PV
-            pv_ac = row[self.p.pv_column] * self.p.eta_inv
-            q_space   = row[self.p.space_heat_column]
-            q_dhw     = row[self.p.dhw_column]
-            heat_req  = q_space + q_dhw                   # kWh_th
-            cop_hp    = max(row[cop_col], 0.1)            # avoid div/0
-            hp_el_kwh = heat_req / cop_hp
-            hp_el_kw  = hp_el_kwh / dt
-
-            plug_kw   = row[self.p.plug_column]
-            load_kw   = plug_kw + hp_el_kw
-            net_kw    = pv_ac - load_kw                   # + surplus / – deficit
-
-            # 2) Surplus branch ------------------------------------------------
-            p_bat_ch = p_bat_disch = 0.0
-            p_elec = p_fc_kw = p_grid_exp = p_grid_imp = 0.0
-            heat_from_fc_kw = 0.0
-
-            if net_kw >= 0:
-                # Charge battery
-                p_bat_ch = self.battery.charge(net_kw)
-                net_after_bat = net_kw - p_bat_ch
-                if net_after_bat > 1e-6:
-                    # Run electrolyser
-                    p_elec = self.h2.electrolyse(net_after_bat)
-                    net_after_bat -= p_elec
-                p_grid_exp = net_after_bat if net_after_bat > EPS else 0.0
-
-            # ---------- DEFICIT PATH --------------------------------------------
-            else:
-                deficit_kw = -net_kw                            # load exceeds PV
-                # 2a) Discharge battery
-                p_bat_disch = self.battery.discharge(deficit_kw)
-                deficit_after_bat = deficit_kw - p_bat_disch
-            
-                # 2b) Fuel-cell if battery not enough and H₂ available
-                if deficit_after_bat > EPS and self.h2.h2 > EPS:
-                    p_fc_kw, heat_from_fc_kw = self.h2.fuel_cell(deficit_after_bat)
-                    deficit_after_bat -= p_fc_kw
-            
-                # 2c) Whatever is still missing is imported from grid,
-                #     but treat values < EPS as numerical noise.
-                p_grid_imp = deficit_after_bat if deficit_after_bat > EPS else 0.0
-            
-                net_after_bat = 0.0  # kept for clarity; not used later
-
-
-            # 4) Log everything -------------------------------------------------
-            self._log(
-                pv_ac=pv_ac,
-                load=load_kw,
-                net_before=net_kw,
-                p_bat_charge=p_bat_ch,
-                p_bat_discharge=p_bat_disch,
-                soc_bat=self.battery.soc,
-                p_elec=p_elec,
-                p_fc=p_fc_kw,
-                h2_store=self.h2.h2,
-                p_grid_export=p_grid_exp,
-                p_grid_import=p_grid_imp,
-                heat_pump_heat=heat_req,
-                heat_from_fc=heat_from_fc_kw * dt,  # convert back to kWh_th
-                heat_total_demand=heat_req,
-                hp_electricity=hp_el_kw,
-            )
+
+        # Instance attributes are hoisted to locals once up front; the
+        # sequential core below then touches only scalars and ndarrays.
+        inp = self.inputs
+        p = self.p
+        cop_arr = np.maximum(inp.cop, 0.1)            # avoid div/0
+
+        # Everything state-free is a plain vector expression; only the
+        # battery/H2 dispatch below has to run sequentially.
+        pv_ac_arr    = inp.pv * p.eta_inv
+        heat_req_arr = inp.q_space + inp.q_dhw        # kWh_th
+        hp_el_arr    = heat_req_arr / cop_arr / dt
+        load_arr     = inp.plug + hp_el_arr
+        net_arr      = pv_ac_arr - load_arr           # + surplus / – deficit
+
+        logs = self.logs
+        logs["pv_ac"][:] = pv_ac_arr
+        logs["load"][:] = load_arr
+        logs["net_before"][:] = net_arr
+        logs["heat_pump_heat"][:] = heat_req_arr
+        logs["heat_total_demand"][:] = heat_req_arr
+        logs["hp_electricity"][:] = hp_el_arr
+
+        bat, h2s = self.battery, self.h2
+        core = _simulate_core if _HAVE_NUMBA else _simulate_core_numpy
+        soc_final, h2_final = core(
+            net_arr, dt,
+            bat.soc, bat.cap, bat.eta_c, bat.eta_d,
+            bat.p_charge_max, bat.p_discharge_max,
+            h2s.h2, h2s.cap, h2s.eta_elec, h2s.eta_fc,
+            h2s.p_elec_max, h2s.p_fc_max,
+            logs["p_bat_charge"], logs["p_bat_discharge"], logs["soc_bat"],
+            logs["p_elec"], logs["p_fc"], logs["h2_store"],
+            logs["p_grid_export"], logs["p_grid_import"],
+            logs["heat_from_fc"],
+        )
+        bat.soc = soc_final
+        h2s.h2 = h2_final
+
+        # Sub-EPS export/import is cascade rounding noise (~1 Wh/h); one
+        # vector pass here replaces the per-hour guards the core used to
+        # carry.
+        for key in ("p_grid_export", "p_grid_import"):
+            buf = logs[key]
+            buf[:] = np.where(buf > _EPS, buf, 0.0)
 
         # 5) Wrap-up & KPIs ----------------------------------------------------
-        results = pd.DataFrame(self.logs)
-        annual_balance = results.p_grid_export.sum() - results.p_grid_import.sum()
+        results = pd.DataFrame(logs, copy=False)
+        # Reduce the raw buffers (no Series construction) with a float64
+        # accumulator so the float32 logs don't lose the kWh-level balance.
+        annual_balance = float(
+            logs["p_grid_export"].sum(dtype=np.float64)
+            - logs["p_grid_import"].sum(dtype=np.float64)
+        )
         print(
             f"Annual grid balance: {annual_balance:.1f} kWh "
             f"({'Zero-energy' if np.isclose(annual_balance, 0, atol=1e-2) else 'Surplus' if annual_balance>0 else 'Deficit'})"
         )
         return results
 
+
+
+# ===== BATCH RUNS ===========================================================
+
+def _run_single(params: SystemParameters, df: pd.DataFrame) -> pd.DataFrame:
+    """Worker entry point: simulate one parameter set on a shared dataset."""
+    return MicrogridSimulator(params, SimInputs.from_dataframe(df, params)).run()
+
+
+def run_sweep(
+    param_grid: List[SystemParameters],
+    df: pd.DataFrame | None = None,
+    max_workers: int | None = None,
+) -> List[pd.DataFrame]:
+    """Run several independent simulations in parallel processes.
+
+    Scenario comparisons (the three COP columns, battery/H2 sizings, ...)
+    are embarrassingly parallel: each worker process runs one simulation on
+    its own core. The hourly dataset is loaded once - from the first
+    scenario's workbook unless *df* is passed in - and shipped to the
+    workers, so the Excel file is never parsed per scenario. Results are
+    returned in the order of *param_grid*.
+    """
+    if not param_grid:
+        return []
+    if df is None:
+        df = ExcelDataLoader(param_grid[0]).load()
+    if max_workers is None:
+        max_workers = min(len(param_grid), os.cpu_count() or 1)
+    with ProcessPoolExecutor(max_workers=max_workers) as pool:
+        return list(pool.map(_run_single, param_grid, [df] * len(param_grid)))
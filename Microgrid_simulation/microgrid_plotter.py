@@ -1,5 +1,7 @@
 ﻿from __future__ import annotations
 
+import os
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
 from typing import List
 
@@ -11,37 +13,48 @@ from Microgrid_simulation import (
     ExcelDataLoader,
     HeatPumpType,
     MicrogridSimulator,
+    SimInputs,
     SystemParameters,
 )
 
 __all__: List[str] = ["run_and_plot"]
 
+# Shared rc overrides for every figure. A simplify threshold of 1.0 lets the
+# Agg renderer drop the maximum number of collinear-ish segments from the
+# 8760-point hourly lines, which is where most of the draw time goes.
+_PLOT_RC = {
+    "path.simplify": True,
+    "path.simplify_threshold": 1.0,
+}
+
 # ════════════════════════════════════════════════════════════════════════════
 # ── Internal helpers ─────────────────────────────────────────────────────────
 # ════════════════════════════════════════════════════════════════════════════
 
-def _daily_sum(series: pd.Series) -> pd.Series:
-    """Return a new Series with one value per day (sum of 24 hours)."""
-    return (
-        series.reset_index(drop=True)
-        .groupby(np.arange(len(series)) // 24)
-        .sum()
-    )
-
-
 def _rolling_mean(series: pd.Series, window: int = 24) -> pd.Series:
-    return series.rolling(window=window, center=True, min_periods=1).mean()
+    # Centered moving average via cumulative-sum differences: a single pass
+    # instead of the general rolling-window machinery. Matches
+    # rolling(center=True, min_periods=1).mean() including the shortened
+    # windows at both edges.
+    arr = series.to_numpy(dtype=np.float64)
+    n = arr.size
+    offset = (window - 1) // 2
+    csum = np.concatenate(([0.0], np.cumsum(arr)))
+    idx = np.arange(n)
+    start = np.clip(idx - window + 1 + offset, 0, n)
+    end = np.clip(idx + 1 + offset, 0, n)
+    return pd.Series((csum[end] - csum[start]) / (end - start), index=series.index)
 
 
 def _compute_electricity_split(res: pd.DataFrame) -> pd.DataFrame:
     """Compute *hourly* contributions whose *daily sums* will be stacked."""
-    load = res["load"]
-    batt = res["p_bat_discharge"].clip(lower=0)
-    fc   = res["p_fc"].clip(lower=0)
-    grid = res["p_grid_import"].clip(lower=0)
+    load = res["load"].to_numpy()
+    batt = np.maximum(res["p_bat_discharge"].to_numpy(), 0.0)
+    fc   = np.maximum(res["p_fc"].to_numpy(), 0.0)
+    grid = np.maximum(res["p_grid_import"].to_numpy(), 0.0)
 
     # PV contribution is whatever remains to cover the load
-    pv = (load - batt - fc - grid).clip(lower=0)
+    pv = np.maximum(load - batt - fc - grid, 0.0)
 
     split = pd.DataFrame(
         {
@@ -49,10 +62,35 @@ def _compute_electricity_split(res: pd.DataFrame) -> pd.DataFrame:
             "Battery": batt,
             "Fuel‑cell": fc,
             "Grid import": grid,
-        }
+        },
+        index=res.index,
+        copy=False,
     )
     return split
 
+
+def _daily_totals(res: pd.DataFrame) -> pd.DataFrame:
+    """Daily sums of every column the daily plots need, in one fused pass.
+
+    Stacks the heat columns and the electricity split into a single
+    (day, hour, column) cube and reduces over the hour axis once, instead
+    of sweeping the 8760-row table separately per plotted series.
+    """
+    split = _compute_electricity_split(res)
+    mat = np.column_stack(
+        (
+            res["heat_pump_heat"].to_numpy(),
+            res["heat_from_fc"].to_numpy(),
+            split.to_numpy(),
+        )
+    )
+    n_full = (mat.shape[0] // 24) * 24
+    daily = mat[:n_full].reshape(-1, 24, mat.shape[1]).sum(axis=1)
+    return pd.DataFrame(
+        daily,
+        columns=["heat_pump_heat", "heat_from_fc", *split.columns],
+    )
+
 # ════════════════════════════════════════════════════════════════════════════
 # ── Plot functions  ──────────────────────────────────────────────────────────
 # ════════════════════════════════════════════════════════════════════════════
@@ -122,9 +160,9 @@ def _plot_h2_only(res: pd.DataFrame) -> None:
     fig.tight_layout()
 
 
-def _plot_heat_distribution(res: pd.DataFrame) -> None:
-    hp_heat_daily = _daily_sum(res["heat_pump_heat"])
-    fc_heat_daily = _daily_sum(res["heat_from_fc"])
+def _plot_heat_distribution(daily: pd.DataFrame) -> None:
+    hp_heat_daily = daily["heat_pump_heat"]
+    fc_heat_daily = daily["heat_from_fc"]
 
     fig, ax = plt.subplots(num="Daily Heat Distribution", figsize=(8, 4))
     ax.stackplot(
@@ -143,9 +181,8 @@ def _plot_heat_distribution(res: pd.DataFrame) -> None:
     fig.tight_layout()
 
 
-def _plot_electricity_distribution(res: pd.DataFrame) -> None:
-    split_hourly = _compute_electricity_split(res)
-    split_daily = split_hourly.apply(_daily_sum)
+def _plot_electricity_distribution(daily: pd.DataFrame) -> None:
+    split_daily = daily[["PV", "Battery", "Fuel‑cell", "Grid import"]]
 
     fig, ax = plt.subplots(num="Daily Electricity Distribution", figsize=(8, 4))
     ax.stackplot(
@@ -191,11 +228,11 @@ def _plot_hp_vs_pv(res: pd.DataFrame) -> None:
     ax1.legend(lines, labels, loc="upper right")
     fig.tight_layout()
 
-def _plot_unserved_energy(res: pd.DataFrame) -> None:
+def _plot_unserved_energy(daily: pd.DataFrame) -> None:
     """Figure 6 – daily energy imported from the grid (should ideally be 0)."""
     EPS_EN = 1e-6  # kWh‑per‑day tolerance: treat smaller values as numerical noise
 
-    shortfall_daily = _daily_sum(res["p_grid_import"])
+    shortfall_daily = daily["Grid import"]
     shortfall_daily = shortfall_daily.where(shortfall_daily > EPS_EN, 0.0)
 
     fig, ax = plt.subplots(num="Daily Unserved Energy", figsize=(9, 3.5))
@@ -212,10 +249,22 @@ def _plot_unserved_energy(res: pd.DataFrame) -> None:
 # ── Public API ───────────────────────────────────────────────────────────────
 # ════════════════════════════════════════════════════════════════════════════
 
+def _render_figure(plot_func, args, save_path: Path) -> None:
+    """Worker: draw one figure on the Agg backend and rasterize it to PNG."""
+    import matplotlib
+
+    matplotlib.use("Agg", force=True)
+    with plt.rc_context(_PLOT_RC):
+        plot_func(*args)
+        plt.gcf().savefig(save_path, dpi=150)
+    plt.close("all")
+
+
 def run_and_plot(
     excel_path: str | Path | None = "EnergiData.xlsx",
     heat_pump: HeatPumpType = HeatPumpType.LV,
     save_dir: Path | None = None,
+    show: bool = True,
 ) -> pd.DataFrame:
     """Run the simulation and generate five improved figures.
 
@@ -228,33 +277,62 @@ def run_and_plot(
     save_dir
         If provided, figures are saved as PNG files into this folder **and**
         still shown on screen. Directory is created if missing.
+    show
+        If False (requires ``save_dir``), nothing is shown on screen and the
+        figures are rasterized in parallel worker processes on the
+        non‑interactive Agg backend – the PNG rendering dominates a batch
+        run, and the eight figures are independent.
 
     Returns
     -------
     pandas.DataFrame
         The hourly results table from the simulator.
     """
+    if save_dir is None and not show:
+        raise ValueError("show=False requires save_dir: nothing would be rendered")
+
     params = SystemParameters(excel_path=excel_path, heat_pump_type=heat_pump)
     raw = ExcelDataLoader(params).load()
-    sim = MicrogridSimulator(params, raw)
+    sim = MicrogridSimulator(params, SimInputs.from_dataframe(raw, params))
     results = sim.run()
 
     # ––– Plot –––
-    _plot_surplus_deficit(results)
-    _plot_storage_combined(results, params)
-    _plot_battery_only(results, params)
-    _plot_h2_only(results)
-    _plot_heat_distribution(results)
-    _plot_electricity_distribution(results)
-    _plot_hp_vs_pv(results)
-    _plot_unserved_energy(results)
-
-    if save_dir is not None:
+    daily = _daily_totals(results)  # shared by all daily-resolution figures
+
+    jobs = [
+        (_plot_surplus_deficit, (results,)),
+        (_plot_storage_combined, (results, params)),
+        (_plot_battery_only, (results, params)),
+        (_plot_h2_only, (results,)),
+        (_plot_heat_distribution, (daily,)),
+        (_plot_electricity_distribution, (daily,)),
+        (_plot_hp_vs_pv, (results,)),
+        (_plot_unserved_energy, (daily,)),
+    ]
+
+    if save_dir is not None and not show:
+        # Headless batch mode: one worker process per figure.
         save_dir = Path(save_dir)
         save_dir.mkdir(parents=True, exist_ok=True)
-        for num in plt.get_fignums():
-            fig = plt.figure(num)
-            fig.savefig(save_dir / f"figure_{num}.png", dpi=150)
+        with ProcessPoolExecutor(max_workers=min(len(jobs), os.cpu_count() or 1)) as pool:
+            futures = [
+                pool.submit(_render_figure, fn, args, save_dir / f"figure_{num}.png")
+                for num, (fn, args) in enumerate(jobs, start=1)
+            ]
+            for future in futures:
+                future.result()
+        return results
+
+    with plt.rc_context(_PLOT_RC):
+        for fn, args in jobs:
+            fn(*args)
+
+        if save_dir is not None:
+            save_dir = Path(save_dir)
+            save_dir.mkdir(parents=True, exist_ok=True)
+            for num in plt.get_fignums():
+                fig = plt.figure(num)
+                fig.savefig(save_dir / f"figure_{num}.png", dpi=150)
 
     plt.show()
     return results